@@ -0,0 +1,117 @@
+"""Render cost per 1k users: building every reminder embed from scratch vs. the shared template.
+
+Run from the repository root: python benchmarks/bench_render.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+import bot
+
+USERS = 1000
+ROUNDS = 20
+
+# Stands in for bot.user, which only exists once the client is logged in
+BOT_USER = SimpleNamespace(display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png"))
+
+now = datetime.now(timezone.utc)
+last_used = (now - timedelta(hours=5)).isoformat()
+users = [
+    (f"user_{i}", {"last_daily": last_used, "last_dk": None, "last_vote": last_used})
+    for i in range(USERS)
+]
+
+def render_before():
+    """The original per-user rendering from send_mudae_reminder"""
+    for username, user_cooldowns in users:
+        daily_status, _ = bot.get_time_remaining(user_cooldowns["last_daily"], 20)
+        dk_status, _ = bot.get_time_remaining(user_cooldowns["last_dk"], 20)
+        vote_status, _ = bot.get_time_remaining(user_cooldowns["last_vote"], 12)
+
+        next_wa_time, _ = bot.get_time_until_next_wa(now + timedelta(minutes=1))
+
+        embed = discord.Embed(
+            title="Mudae Helper: Announcements",
+            description=f"Account: **{username}**",
+            color=discord.Color.from_rgb(88, 101, 242),
+        )
+        embed.add_field(
+            name="Main Commands",
+            value=(
+                f">>> **$wa:** **NOW!**\n"
+                f"**$daily:** {daily_status}\n"
+                f"**$dk:** {dk_status}\n"
+                f"**$vote:** {vote_status}\n"
+                f"**Next $wa:** {next_wa_time}"
+            ),
+            inline=False
+        )
+        embed.set_footer(text=bot.create_footer(), icon_url=BOT_USER.display_avatar.url)
+
+def render_after():
+    """Shared template built once per tick, per-user fields patched in"""
+    bot.embed_templates.clear()
+    next_wa_time, _ = bot.get_time_until_next_wa(now + timedelta(minutes=1))
+    template = bot.get_embed_template("Mudae Helper: Announcements", now, BOT_USER)
+    for username, user_cooldowns in users:
+        field_value = bot.render_reminder_field(user_cooldowns, next_wa_time, now)
+        bot.render_embed(template, username, "Main Commands", field_value)
+
+def render_status_before():
+    """!status for the same user many times within one second - original rendering"""
+    username, user_cooldowns = users[0]
+    for _ in range(USERS):
+        _, daily_remaining = bot.get_time_remaining(user_cooldowns["last_daily"], 20)
+        _, dk_remaining = bot.get_time_remaining(user_cooldowns["last_dk"], 20)
+        _, vote_remaining = bot.get_time_remaining(user_cooldowns["last_vote"], 12)
+
+        next_wa_time, _ = bot.get_time_until_next_wa(now)
+
+        embed = discord.Embed(
+            title="Mudae Helper: Cooldowns",
+            description=f"Account: **{username}**",
+            color=discord.Color.from_rgb(88, 101, 242),
+        )
+        embed.add_field(
+            name="Next Commands",
+            value=(
+                f">>> **$wa:** {next_wa_time}\n"
+                f"**$daily:** {bot.format_timedelta(daily_remaining)}\n"
+                f"**$dk:** {bot.format_timedelta(dk_remaining)}\n"
+                f"**$vote:** {bot.format_timedelta(vote_remaining)}"
+            ),
+            inline=False
+        )
+        embed.set_footer(text=bot.create_footer(), icon_url=BOT_USER.display_avatar.url)
+
+def render_status_after():
+    """!status for the same user many times within one second - template + memoized field"""
+    bot.embed_templates.clear()
+    bot.render_status_field.cache_clear()
+    status_now = now.replace(microsecond=0)
+    username, user_cooldowns = users[0]
+    for _ in range(USERS):
+        field_value = bot.render_status_field(
+            user_cooldowns["last_daily"],
+            user_cooldowns["last_dk"],
+            user_cooldowns["last_vote"],
+            status_now
+        )
+        template = bot.get_embed_template("Mudae Helper: Cooldowns", status_now, BOT_USER)
+        bot.render_embed(template, username, "Next Commands", field_value)
+
+if __name__ == "__main__":
+    print(f"Render cost per {USERS} users (best of {ROUNDS}):")
+    for name, func in [
+        ("reminder before", render_before),
+        ("reminder after", render_after),
+        ("!status before", render_status_before),
+        ("!status after", render_status_after),
+    ]:
+        best = min(timeit.repeat(func, number=1, repeat=ROUNDS))
+        print(f"  • {name}: {best * 1000:.2f}ms")
@@ -4,6 +4,12 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 import os
 import json
+import functools
+import cProfile
+import sys
+import threading
+import time
+import traceback
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,6 +17,31 @@ load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 MUDAE_CHANNEL_ID = 1129823274684137602  # ID of Mudae channel
 
+# PROFILING (disabled unless PROFILING_ENABLED=1 - nothing is started otherwise)
+# Optional .env settings:
+#   PROFILING_ENABLED=1          enables !profile and event loop stall logging
+#   PROFILING_ADMIN_ID=<user id> the only user allowed to run !profile (in DM)
+#   LOOP_LAG_THRESHOLD_MS=250    stalls longer than this are logged to profiles/
+def get_int_env(name, default):
+    """Reads an integer from the environment - FALLS BACK TO DEFAULT IF INVALID"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️ Warning: {name}={value!r} is not a number, using {default}")
+        return default
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '0') == '1'
+PROFILING_ADMIN_ID = 0  # Only this user can run !profile
+LOOP_LAG_THRESHOLD_MS = 250
+if PROFILING_ENABLED:
+    PROFILING_ADMIN_ID = get_int_env('PROFILING_ADMIN_ID', 0)
+    LOOP_LAG_THRESHOLD_MS = max(get_int_env('LOOP_LAG_THRESHOLD_MS', 250), 10)  # Lower values would busy-loop
+PROFILE_DIR = "profiles"
+MAX_PROFILE_SECONDS = 300
+
 # CONFIGURATION FILES
 COOLDOWN_FILE = "cooldowns.json"
 CONFIG_FILE = "config.json"
@@ -21,6 +52,15 @@ recent_commands = {}  # {user_id: {"command": "daily/dk/vote", "timestamp": date
 # Track who has received notifications this hour to prevent duplicates
 notified_users = {}  # {user_id: last_notification_hour}
 
+# Shared embed templates - rebuilt once per minute instead of once per user
+embed_templates = {}  # {title: (minute, embed dict)}
+EMBED_COLOR = discord.Color.from_rgb(88, 101, 242)
+
+# Profiling state
+active_profiler = None  # cProfile.Profile while a !profile capture is running
+loop_heartbeat = 0.0  # time.monotonic() of the last event loop tick
+loop_monitor_started = False
+
 # Load configuration - ONLY ALLOWED USERS WILL BE PROCESSED
 def load_config():
     """Loads allowed users from config.json - ONLY THESE USERS WILL BE PROCESSED"""
@@ -112,7 +152,7 @@ def is_user_allowed(user_id):
     """Check if user is in allowed list"""
     return int(user_id) in allowed_users
 
-def get_time_remaining(last_used_str, cooldown_hours=20):
+def get_time_remaining(last_used_str, cooldown_hours=20, now=None):
     """Calculates remaining time with precision (hours and minutes) - MAINTAINS UTC"""
     if not last_used_str:
         return "Available", timedelta(hours=0)
@@ -122,7 +162,8 @@ def get_time_remaining(last_used_str, cooldown_hours=20):
         last_used = last_used.replace(tzinfo=timezone.utc)
     
     next_available = last_used + timedelta(hours=cooldown_hours)
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
     
     if now >= next_available:
         return "Available", timedelta(hours=0)
@@ -190,6 +231,56 @@ def format_timedelta(remaining_delta):
     
     return " ".join(parts)
 
+def get_embed_template(title, now, bot_user):
+    """Builds the parts of an embed shared by every user (title, color, footer) once per minute"""
+    minute = now.replace(second=0, microsecond=0)
+    cached = embed_templates.get(title)
+    if cached and cached[0] == minute:
+        return cached[1]
+    
+    template = discord.Embed(title=title, color=EMBED_COLOR)
+    template.set_footer(text=create_footer(), icon_url=bot_user.display_avatar.url)
+    template = template.to_dict()
+    embed_templates[title] = (minute, template)
+    return template
+
+def render_embed(template, username, field_name, field_value):
+    """Creates a user's embed from a shared template, patching only the per-user fields"""
+    data = dict(template)
+    data["footer"] = dict(template["footer"])  # Don't share the cached template's footer
+    data["description"] = f"Account: **{username}**"
+    data["fields"] = [{"name": field_name, "value": field_value, "inline": False}]
+    return discord.Embed.from_dict(data)
+
+def render_reminder_field(user_cooldowns, next_wa_time, now):
+    """Field value for the :03 reminder"""
+    daily_status, _ = get_time_remaining(user_cooldowns["last_daily"], 20, now)
+    dk_status, _ = get_time_remaining(user_cooldowns["last_dk"], 20, now)
+    vote_status, _ = get_time_remaining(user_cooldowns["last_vote"], 12, now)
+    
+    return (
+        f">>> **$wa:** **NOW!**\n"
+        f"**$daily:** {daily_status}\n"
+        f"**$dk:** {dk_status}\n"
+        f"**$vote:** {vote_status}\n"
+        f"**Next $wa:** {next_wa_time}"
+    )
+
+@functools.lru_cache(maxsize=256)
+def render_status_field(last_daily, last_dk, last_vote, now):
+    """Field value for !status - memoized, so repeated calls within the same second are free"""
+    _, daily_remaining = get_time_remaining(last_daily, 20, now)
+    _, dk_remaining = get_time_remaining(last_dk, 20, now)
+    _, vote_remaining = get_time_remaining(last_vote, 12, now)
+    next_wa_time, _ = get_time_until_next_wa(now)
+    
+    return (
+        f">>> **$wa:** {next_wa_time}\n"
+        f"**$daily:** {format_timedelta(daily_remaining)}\n"
+        f"**$dk:** {format_timedelta(dk_remaining)}\n"
+        f"**$vote:** {format_timedelta(vote_remaining)}"
+    )
+
 def update_cooldown(user_id, command_type, username=None):
     """Updates cooldown for a specific command - MAINTAINS ISO UTC FORMAT"""
     now_utc = datetime.now(timezone.utc).isoformat()
@@ -237,6 +328,10 @@ async def send_mudae_reminder():
         if current_hour != notified_users[user_id]:
             del notified_users[user_id]
     
+    # Same for every user in this tick
+    next_wa_time, _ = get_time_until_next_wa(now + timedelta(minutes=1))
+    template = get_embed_template("Mudae Helper: Announcements", now, bot.user)
+    
     for user_id_str in list(cooldowns.keys()):
         user_id = int(user_id_str)
         
@@ -262,31 +357,8 @@ async def send_mudae_reminder():
         username = cooldowns[user_id_str].get("user_account", str(user_id))
         user_cooldowns = cooldowns[user_id_str]
         
-        daily_status, _ = get_time_remaining(user_cooldowns["last_daily"], 20)
-        dk_status, _ = get_time_remaining(user_cooldowns["last_dk"], 20)
-        vote_status, _ = get_time_remaining(user_cooldowns["last_vote"], 12)
-        
-        next_wa_time, _ = get_time_until_next_wa(now + timedelta(minutes=1))
-        
-        embed = discord.Embed(
-            title="Mudae Helper: Announcements",
-            description=f"Account: **{username}**",
-            color=discord.Color.from_rgb(88, 101, 242),
-        )
-
-        embed.add_field(
-            name="Main Commands",
-            value=(
-                f">>> **$wa:** **NOW!**\n"
-                f"**$daily:** {daily_status}\n"
-                f"**$dk:** {dk_status}\n"
-                f"**$vote:** {vote_status}\n"
-                f"**Next $wa:** {next_wa_time}"
-            ),
-            inline=False
-        )
-        
-        embed.set_footer(text=create_footer(), icon_url=bot.user.display_avatar.url)
+        field_value = render_reminder_field(user_cooldowns, next_wa_time, now)
+        embed = render_embed(template, username, "Main Commands", field_value)
         
         try:
             await user.send(embed=embed)
@@ -300,6 +372,85 @@ async def send_mudae_reminder():
     with open("notified_users.json", "w") as f:
         json.dump({str(k): v for k, v in notified_users.items()}, f)
 
+def new_profile_path(prefix, extension):
+    """Returns a new timestamped path inside PROFILE_DIR"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(PROFILE_DIR, f"{prefix}_{stamp}.{extension}")
+
+async def loop_heartbeat_task():
+    """Ticks the heartbeat so the watchdog thread can detect event loop stalls"""
+    global loop_heartbeat
+    interval = LOOP_LAG_THRESHOLD_MS / 1000 / 4
+    while True:
+        loop_heartbeat = time.monotonic()
+        await asyncio.sleep(interval)
+
+def loop_watchdog(loop_thread_id):
+    """Runs in a separate thread - logs the event loop stack when a tick is late"""
+    threshold = LOOP_LAG_THRESHOLD_MS / 1000
+    reported_heartbeat = None
+    log_path = None  # Created on the first stall
+    while True:
+        time.sleep(threshold / 2)
+        heartbeat = loop_heartbeat
+        lag = time.monotonic() - heartbeat
+        # Report each stall once, while the blocking code is still on the stack
+        if lag < threshold or heartbeat == reported_heartbeat:
+            continue
+        reported_heartbeat = heartbeat
+        frame = sys._current_frames().get(loop_thread_id)
+        if frame is None:
+            continue
+        stack = "".join(traceback.format_stack(frame))
+        if log_path is None:
+            log_path = new_profile_path("loop_stalls", "log")
+        with open(log_path, "a") as f:
+            f.write(f"[{datetime.now().isoformat()}] Event loop blocked for {lag * 1000:.0f}ms+\n")
+            f.write(stack)
+            f.write("\n")
+        print(f"[PROFILE] ⚠️ Event loop blocked for {lag * 1000:.0f}ms+ - stack saved to {log_path}")
+
+def start_loop_monitor():
+    """Starts event loop lag capture once - ONLY WHEN PROFILING IS ENABLED"""
+    global loop_monitor_started, loop_heartbeat
+    if not PROFILING_ENABLED or loop_monitor_started:
+        return
+    loop_monitor_started = True
+    loop_heartbeat = time.monotonic()
+    bot.loop.create_task(loop_heartbeat_task())
+    watchdog = threading.Thread(target=loop_watchdog, args=(threading.get_ident(),), daemon=True)
+    watchdog.start()
+    print(f'Profiling enabled: logging event loop stalls over {LOOP_LAG_THRESHOLD_MS}ms to {PROFILE_DIR}/')
+
+def claim_profiler():
+    """Reserves the single capture slot - MUST BE CALLED BEFORE ANY AWAIT"""
+    global active_profiler
+    if active_profiler is not None:
+        return None
+    active_profiler = cProfile.Profile()
+    return active_profiler
+
+def release_profiler(profiler):
+    """Unhooks the profiler and frees the capture slot if it still belongs to it"""
+    global active_profiler
+    profiler.disable()
+    if active_profiler is profiler:
+        active_profiler = None
+
+async def run_profile_capture(profiler, seconds):
+    """Profiles the running bot with cProfile for a limited time and saves the stats"""
+    try:
+        profiler.enable()
+        await asyncio.sleep(seconds)
+        profiler.disable()
+        path = new_profile_path("profile", "prof")
+        profiler.dump_stats(path)
+        return path
+    finally:
+        # Always unhook the profiler, even if the capture was cancelled
+        release_profiler(profiler)
+
 @bot.event
 async def on_ready():
     print(f'{bot.user} is ready and running')
@@ -328,6 +479,7 @@ async def on_ready():
         print(f'⚠️ Warning: Cannot access Mudae channel (ID: {MUDAE_CHANNEL_ID})')
         print('   Make sure the bot is in the server and has permissions to view the channel')
     
+    start_loop_monitor()
     send_mudae_reminder.start()
 
 @bot.event
@@ -579,32 +731,17 @@ async def on_message(message):
             save_cooldowns(cooldowns)
         
         user_cooldowns = cooldowns[user_id]
-        now = datetime.now(timezone.utc)
+        # Truncated to the second so repeated !status calls hit the cache
+        now = datetime.now(timezone.utc).replace(microsecond=0)
         
-        daily_status, daily_remaining = get_time_remaining(user_cooldowns["last_daily"], 20)
-        dk_status, dk_remaining = get_time_remaining(user_cooldowns["last_dk"], 20)
-        vote_status, vote_remaining = get_time_remaining(user_cooldowns["last_vote"], 12)
-        
-        next_wa_time, _ = get_time_until_next_wa(now)
-        
-        embed = discord.Embed(
-            title="Mudae Helper: Cooldowns",
-            description=f"Account: **{username}**",
-            color=discord.Color.from_rgb(88, 101, 242),
-        )
-        
-        embed.add_field(
-            name="Next Commands",
-            value=(
-                f">>> **$wa:** {next_wa_time}\n"
-                f"**$daily:** {format_timedelta(daily_remaining)}\n"
-                f"**$dk:** {format_timedelta(dk_remaining)}\n"
-                f"**$vote:** {format_timedelta(vote_remaining)}"
-            ),
-            inline=False
+        field_value = render_status_field(
+            user_cooldowns["last_daily"],
+            user_cooldowns["last_dk"],
+            user_cooldowns["last_vote"],
+            now
         )
-        
-        embed.set_footer(text=create_footer(), icon_url=bot.user.display_avatar.url)
+        template = get_embed_template("Mudae Helper: Cooldowns", now, bot.user)
+        embed = render_embed(template, username, "Next Commands", field_value)
         
         await message.channel.send(embed=embed)
         print(f"[{now.strftime('%H:%M')}] !status used by {username}")
@@ -636,6 +773,40 @@ async def on_message(message):
             update_cooldown(message.author.id, "vote", username)
             await message.channel.send("$vote registered successfully\nNext available in 12 hours")
     
+    elif content == "!profile" or content.startswith("!profile "):
+        # Admin only, in DM only
+        if message.author.id != PROFILING_ADMIN_ID or message.guild is not None:
+            return
+        
+        if not PROFILING_ENABLED:
+            await message.channel.send("Profiling is disabled\nSet PROFILING_ENABLED=1 in .env and restart the bot")
+            return
+        
+        parts = content.split()
+        try:
+            seconds = int(parts[1]) if len(parts) > 1 else 30
+        except ValueError:
+            await message.channel.send("Usage: !profile [seconds]")
+            return
+        seconds = max(1, min(seconds, MAX_PROFILE_SECONDS))
+        
+        profiler = claim_profiler()
+        if profiler is None:
+            await message.channel.send("A profile capture is already running")
+            return
+        
+        try:
+            await message.channel.send(f"Profiling for {seconds}s...")
+            print(f"[PROFILE] Capture started for {seconds}s")
+            path = await run_profile_capture(profiler, seconds)
+        except Exception as e:
+            release_profiler(profiler)
+            print(f"[PROFILE] ❌ Capture failed: {e}")
+            await message.channel.send(f"Profile capture failed: {e}")
+            return
+        print(f"[PROFILE] ✅ Capture saved to {path}")
+        await message.channel.send(f"Profile saved to `{path}`\nOpen it with: python -m pstats {path}")
+    
     elif content == "!help" or content == "!ayuda":
         help_text = f"""
 ✅ **AUTHORIZED USERS ONLY** ✅